@@ -6,7 +6,11 @@ This script scrapes track information from 1001tracklists.com and creates
 a Tidal playlist with those tracks.
 
 Requirements:
-- selenium
+- requests
+- lxml
+- cssselect
+- rapidfuzz
+- selenium (fallback for JS-rendered pages)
 - tidalapi
 - python-dotenv
 - configparser
@@ -17,15 +21,45 @@ import argparse
 import sys
 import os
 import json
+import re
 import time
+import hashlib
+import random
 import configparser
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RetryError
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml.cssselect import CSSSelector
+from rapidfuzz import fuzz
 from selenium import webdriver
 from selenium.webdriver.firefox.options import Options
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import tidalapi
+from tidalapi.exceptions import TooManyRequests
+
+
+# Suffixes ignored when deduplicating: "[Label]" tags and plain mix names like
+# "(Original Mix)". Remix/edit credits are kept, since those are different tracks
+DEDUPE_NOISE_RE = re.compile(r'\[[^\]]*\]|\((?:original|extended|radio)?\s*(?:mix|edit)?\)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _parse_ini(path, mtime):
+    """Parse an .ini file into a dict of sections (re-read only when mtime changes)"""
+    config = configparser.ConfigParser()
+    config.read(path)
+    return {section: dict(config[section]) for section in config.sections()}
 
 
 class Config:
@@ -36,11 +70,15 @@ class Config:
         self.client_secret = None
         self.playlist_name = None
         self.tracklist_urls = []
+        self._env_loaded = set()
 
     def load_from_env(self, env_file='.env'):
         """Load configuration from .env file"""
         if os.path.exists(env_file):
-            load_dotenv(env_file)
+            # Only read each .env file into the environment once
+            if env_file not in self._env_loaded:
+                load_dotenv(env_file, verbose=False)
+                self._env_loaded.add(env_file)
             self.client_id = os.getenv('TIDAL_CLIENT_ID')
             self.client_secret = os.getenv('TIDAL_CLIENT_SECRET')
             self.playlist_name = os.getenv('PLAYLIST_NAME', 'My 1001tracklists Playlist')
@@ -52,8 +90,7 @@ class Config:
     def load_from_ini(self, ini_file='conf.ini'):
         """Load configuration from .ini file"""
         if os.path.exists(ini_file):
-            config = configparser.ConfigParser()
-            config.read(ini_file)
+            config = _parse_ini(os.path.abspath(ini_file), os.path.getmtime(ini_file))
 
             if 'tidal' in config:
                 self.client_id = config['tidal'].get('client_id')
@@ -122,31 +159,83 @@ urls = https://www.1001tracklists.com/tracklist/example1.html,https://www.1001tr
 class TracklistScraper:
     """Scraper for 1001tracklists.com"""
 
+    ROW_SELECTOR = 'div.tlpTog.bItm.tlpItem'
+    # Compound selector that reaches the "ARTIST - TITLE" span of each row directly
+    TRACK_SELECTOR = f'{ROW_SELECTOR} .trackValue.notranslate.blueTxt'
+    # Translated to XPath once instead of on every page
+    TRACK_XPATH = CSSSelector(TRACK_SELECTOR)
+
+    USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64; rv:128.0) '
+                  'Gecko/20100101 Firefox/128.0')
+
     def __init__(self, headless=True):
-        self.driver = None
         self.headless = headless
+        self.started = False
+        # Each worker thread lazily gets its own HTTP session and browser
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions = []
+        self._drivers = []
 
     def start_browser(self):
-        """Initialize the Firefox WebDriver"""
+        """Prepare the scraper; sessions and browsers are created per thread on demand"""
+        self.started = True
+        return True
+
+    def stop_browser(self):
+        """Close every HTTP session and fallback browser opened by any thread"""
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            for driver in self._drivers:
+                driver.quit()
+            self._sessions = []
+            self._drivers = []
+        self.started = False
+
+    def _get_session(self):
+        """Return the HTTP session for the current thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': self.USER_AGENT,
+                'Accept-Language': 'en-US,en;q=0.9'
+            })
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _get_driver(self):
+        """Return the Firefox WebDriver for the current thread (only needed for JS-rendered pages)"""
+        driver = getattr(self._local, 'driver', None)
+        if driver is not None:
+            return driver
+
         try:
             options = Options()
             if self.headless:
                 options.add_argument('--headless')
-            self.driver = webdriver.Firefox(options=options)
-            return True
+            # Only the track text matters - skip images and media, and
+            # return as soon as the DOM is ready instead of the full load
+            options.set_preference('permissions.default.image', 2)
+            options.set_preference('media.autoplay.default', 5)
+            options.page_load_strategy = 'eager'
+            driver = webdriver.Firefox(options=options)
         except WebDriverException as e:
             print(f"Error starting browser: {e}")
             print("Make sure geckodriver is installed and Firefox is available.")
-            return False
+            return None
 
-    def stop_browser(self):
-        """Close the browser"""
-        if self.driver:
-            self.driver.quit()
+        self._local.driver = driver
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
 
     def scrape_tracklist(self, url):
         """Scrape tracks from a 1001tracklists URL"""
-        if not self.driver:
+        if not self.started:
             print("Browser not started!")
             return []
 
@@ -154,47 +243,223 @@ class TracklistScraper:
         tracks = []
 
         try:
-            self.driver.get(url)
-            time.sleep(5)
+            response = self._get_session().get(url, timeout=15)
+            response.raise_for_status()
+            tree = lxml.html.fromstring(response.text)
 
-            for row in self.driver.find_elements(By.CSS_SELECTOR, 'div.tlpTog.bItm.tlpItem'):
-                try:
-                    # Everything is in one span
-                    trackval = row.find_element(By.CSS_SELECTOR, '.trackValue.notranslate.blueTxt').text.strip()
-                    # It's usually "ARTIST(S) - TITLE"
-                    if " - " in trackval:
-                        artist, title = trackval.split(" - ", 1)
-                    else:
-                        # fallback if weird format
-                        artist = trackval
-                        title = ""
-                    tracks.append({'artist': artist.strip(), 'title': title.strip()})
-                except NoSuchElementException:
-                    continue
+            for leaf in self.TRACK_XPATH(tree):
+                tracks.append(self._parse_trackval(leaf.text_content().strip()))
 
         except Exception as e:
-            print(f"Error scraping {url}: {e}")
+            print(f"Error fetching {url}: {e}")
+
+        if not tracks:
+            # Nothing in the static HTML - the page is probably rendered by JS
+            print("No tracks in static HTML, falling back to browser...")
+            tracks = self._scrape_with_browser(url)
 
         print(f"Found {len(tracks)} tracks")
         return tracks
 
+    def _scrape_with_browser(self, url):
+        """Scrape tracks from a 1001tracklists URL using Selenium"""
+        driver = self._get_driver()
+        if not driver:
+            return []
+
+        tracks = []
+
+        try:
+            driver.get(url)
+            try:
+                # Wait for the tracklist to render instead of a fixed sleep
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.ROW_SELECTOR))
+                )
+            except TimeoutException:
+                print(f"Timed out waiting for tracks on {url}")
+
+            # Pull every track value in a single WebDriver round-trip
+            trackvals = driver.execute_script(
+                "return Array.from(document.querySelectorAll(arguments[0]))"
+                ".map(e => e.textContent.trim());",
+                self.TRACK_SELECTOR
+            )
+            for trackval in trackvals or []:
+                tracks.append(self._parse_trackval(trackval))
+
+        except Exception as e:
+            print(f"Error scraping {url}: {e}")
+
+        return tracks
+
+    @staticmethod
+    def _parse_trackval(trackval):
+        """Split a track value into artist and title"""
+        # It's usually "ARTIST(S) - TITLE"; without a separator the
+        # whole value ends up in artist and title stays empty
+        artist, _, title = trackval.partition(" - ")
+        return {'artist': artist.strip(), 'title': title.strip()}
+
+
+
 
+class TidalSearchCache:
+    """Persistent cache of artist/title -> Tidal track ID matches"""
+
+    DEFAULT_PATH = Path.home() / '.cache' / 'tidal-playlisteator' / 'search.json'
+    MAX_AGE = 30 * 24 * 3600  # Re-search after 30 days in case the catalogue changed
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load cached matches from disk"""
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Atomically write cached matches to disk if anything changed"""
+        if not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Could not save search cache: {e}")
+
+    @staticmethod
+    def _key(artist, title):
+        return hashlib.sha1(f"{artist.lower()}|{title.lower()}".encode()).hexdigest()
+
+    def get(self, artist, title, min_score):
+        """Return the cached Tidal track ID for a track, or None if missing, weak or stale"""
+        entry = self.entries.get(self._key(artist, title))
+        if not entry or entry.get('score', 0) < min_score:
+            return None
+        if time.time() - entry.get('ts', 0) > self.MAX_AGE:
+            return None
+        return entry['track_id']
+
+    def set(self, artist, title, track_id, score):
+        """Remember the Tidal track ID matched for a track"""
+        self.entries[self._key(artist, title)] = {
+            'track_id': int(track_id),
+            'score': round(score, 3),
+            'ts': int(time.time())
+        }
+        self.dirty = True
+
+
+class MockPlaylist:
+    """Minimal playlist object for playlists created through the direct API"""
+
+    def __init__(self, uuid, session, http, etag=None):
+        self.uuid = uuid
+        self.session = session
+        self._http = http
+        self._add_url = f"https://api.tidal.com/v1/playlists/{uuid}/items"
+        self._etag = etag
+        self.num_tracks = 0
+        self._token = None
+        self._headers = None
+
+    def _auth_headers(self):
+        """Return the auth headers, rebuilt only when the access token changes"""
+        token = self.session.access_token
+        if token != self._token:
+            self._token = token
+            self._headers = {
+                'X-Tidal-Token': token,
+                'Authorization': f'Bearer {token}'
+            }
+        return self._headers
+
+    def add(self, track_ids):
+        """Add tracks and return the added IDs, like tidalapi's UserPlaylist.add"""
+        # The items endpoint takes a comma-joined list, so one POST adds a whole batch;
+        # SKIP keeps one unavailable track from rejecting the rest of it
+        add_data = {
+            'onArtifactNotFound': 'SKIP',
+            'trackIds': ','.join(map(str, track_ids)),
+            'toIndex': self.num_tracks,
+            'onDupes': 'ADD'
+        }
+        headers = self._auth_headers()
+        if self._etag:
+            headers = {**headers, 'If-None-Match': self._etag}
+        response = self._http.post(self._add_url, data=add_data, headers=headers)
+        response.raise_for_status()
+        # The playlist changed, so the old etag no longer applies
+        self._etag = response.headers.get('etag')
+
+        try:
+            added_items = response.json().get('addedItemIds')
+        except ValueError:
+            added_items = None
+        if not added_items:
+            return []
+        self.num_tracks += len(added_items)
+        return added_items
 
 
 class TidalPlaylistCreator:
     """Creates Tidal playlists from track lists"""
 
+    MATCH_THRESHOLD = 0.75  # Slightly higher threshold for faster decisions
+    STRONG_MATCH = 0.85  # Good enough to stop searching
+    SEARCH_WORKERS = 16  # Parallel Tidal searches
+    QUERY_DELAY = 0  # Only pause after empty results
+
+    # Playlist creation methods, in the order they are tried
+    CREATE_STRATEGIES = ('standard', 'no_description', 'direct')
+    STRATEGY_PATH = Path.home() / '.cache' / 'tidal-playlisteator' / 'strategy'
+
     def __init__(self, client_id, client_secret):
         self.client_id = client_id
         self.client_secret = client_secret
         self.session = None
+        self.cache = TidalSearchCache()
+        self._norm = None
+        self._create_strategy = None
+        # tidalapi 0.8 returns a dict; authenticate() confirms the shape once
+        self._extract = lambda result: result.get('tracks') or []
+
+        # One pooled, keep-alive HTTP session for all direct API calls.
+        # Retry backs off on 429/5xx responses for GETs only: tidalapi creates
+        # playlists with a PUT, and resending it would create duplicates
+        self._adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset({'GET'})
+            )
+        )
+        self._http = requests.Session()
+        self._http.mount('https://', self._adapter)
 
     def authenticate(self):
         """Authenticate with Tidal"""
         try:
             self.session = tidalapi.Session()
+            # Searches go through tidalapi's own session, so give it the same pool and retries
+            self.session.request_session.mount('https://', self._adapter)
             print("Please log in to Tidal in your browser...")
             self.session.login_oauth_simple()
+            self._bind_extractor()
             return True
         except Exception as e:
             print(f"Tidal authentication failed: {e}")
@@ -207,175 +472,93 @@ class TidalPlaylistCreator:
             return False
 
         try:
-            # Try alternative approach - create playlist using session request directly
-            import requests
-
-            # Get user playlists first to see the format
-            user = self.session.user
-
-            # Try creating playlist with minimal request
-            try:
-                # Method 1: Try the standard approach but catch specific error
-                playlist = user.create_playlist(playlist_name, description)
-            except Exception as e:
-                print(f"Standard method failed: {e}")
-
-                # Method 2: Try creating without description first
-                try:
-                    playlist = user.create_playlist(playlist_name, "")
-                except Exception as e2:
-                    print(f"No description method failed: {e2}")
-
-                    # Method 3: Use session's internal request method
-                    try:
-                        session_id = self.session.session_id
-                        country_code = self.session.country_code
-
-                        url = f"https://api.tidal.com/v1/users/{user.id}/playlists"
-                        headers = {
-                            'X-Tidal-Token': self.session.access_token,
-                            'Authorization': f'Bearer {self.session.access_token}',
-                            'Content-Type': 'application/json'
-                        }
-                        data = {
-                            'title': playlist_name,
-                            'description': description[:500]  # Limit description length
-                        }
-
-                        response = requests.post(url, json=data, headers=headers)
-                        if response.status_code == 201:
-                            playlist_data = response.json()
-                            # Create a mock playlist object for adding tracks
-                            class MockPlaylist:
-                                def __init__(self, uuid, session):
-                                    self.uuid = uuid
-                                    self.session = session
-
-                                def add(self, track_ids):
-                                    add_url = f"https://api.tidal.com/v1/playlists/{self.uuid}/items"
-                                    add_headers = {
-                                        'X-Tidal-Token': self.session.access_token,
-                                        'Authorization': f'Bearer {self.session.access_token}',
-                                        'Content-Type': 'application/json'
-                                    }
-                                    add_data = {'trackIds': track_ids}
-                                    return requests.post(add_url, json=add_data, headers=add_headers)
-
-                            playlist = MockPlaylist(playlist_data['uuid'], self.session)
-                            print(f"Created playlist using direct API: {playlist_name}")
-                        else:
-                            print(f"Direct API failed: {response.status_code} - {response.text}")
-                            return False
-                    except Exception as e3:
-                        print(f"Direct API method failed: {e3}")
-                        return False
+            playlist = self._create_tidal_playlist(playlist_name, description)
+            if playlist is None:
+                return False
 
             added_count = 0
             not_found_count = 0
 
-            # Use improved search logic with multiple strategies and rate limiting
+            # Reuse matches from previous runs before hitting the search API
+            track_ids = [None] * len(tracks)
+            pending = []
             for i, tr in enumerate(tracks):
-                print(f"Processing track {i+1}/{len(tracks)}: {tr['artist']} - {tr['title']}")
-                track_found = False
-
-                # Smart search strategies - avoid overly generic queries
-                search_queries = []
-
-                # Start with most likely to succeed queries first
-                search_queries.extend([
-                    f"{tr['artist']} {tr['title']}",  # Original - most likely
-                    f'"{tr['artist']}" "{tr['title']}"',  # Quoted for exact match
-                    f"{tr['artist']} - {tr['title']}",  # With dash
-                ])
-
-                # Only add additional variations if first attempts fail
-                # This reduces total searches per track
-                search_queries.extend([
-                    f"{tr['title']} {tr['artist']}",  # Reversed
-                ])
-
-                # Add remix/version variations
-                if '(' in tr['title']:
-                    base_title = tr['title'].split('(')[0].strip()
-                    if len(base_title) > 8:  # Only if base title is specific enough
-                        search_queries.append(f"{tr['artist']} {base_title}")
-
-                if '[' in tr['title']:
-                    base_title = tr['title'].split('[')[0].strip()
-                    if len(base_title) > 8:
-                        search_queries.append(f"{tr['artist']} {base_title}")
-
-                for query_idx, query in enumerate(search_queries):
-                    if track_found:
-                        break
+                cached_id = self.cache.get(tr['artist'], tr['title'], self.STRONG_MATCH)
+                if cached_id:
+                    print(f"✓ Matched (cached): {tr['artist']} - {tr['title']}")
+                    track_ids[i] = cached_id
+                else:
+                    pending.append(i)
+
+            # Lowercase the track fields once instead of on every comparison
+            self._norm = normalize_tracks(tracks)
+
+            # Tracks sharing an artist can be matched from a single artist search
+            by_artist = defaultdict(list)
+            for i in pending:
+                by_artist[self._norm['artist_lc'][i]].append(i)
+            groups = [indices for indices in by_artist.values() if len(indices) > 1]
+
+            grouped = {i for indices in groups for i in indices}
+
+            # Searches are independent and I/O bound, so submit them all up front:
+            # artist searches and single-track searches run side by side
+            with ThreadPoolExecutor(max_workers=self.SEARCH_WORKERS) as executor:
+                print(f"Searching Tidal for {len(pending)} tracks ({len(groups)} repeat artists)...")
+                group_futures = [executor.submit(self._match_artist_group, indices, tracks) for indices in groups]
+                track_futures = {
+                    i: executor.submit(self._find_tidal_id, i, tracks[i])
+                    for i in pending if i not in grouped
+                }
+
+                for indices, future in zip(groups, group_futures):
+                    try:
+                        matches = future.result()
+                    except Exception as search_error:
+                        print(f"    Artist search failed: {search_error}")
+                        matches = {}
 
-                    # Reduced delay - only wait after failed searches
-                    if query_idx > 2:  # Only delay after trying first 3 queries
-                        time.sleep(0.2)  # Reduced to 200ms
+                    for i, (tidal_id, match_score) in matches.items():
+                        track_ids[i] = tidal_id
+                        self.cache.set(tracks[i]['artist'], tracks[i]['title'], tidal_id, match_score)
 
-                    # Skip overly generic queries
-                    if len(query.strip()) < 5:
-                        continue
+                    # Only titles the artist search couldn't match get their own queries
+                    for i in indices:
+                        if not track_ids[i]:
+                            track_futures[i] = executor.submit(self._find_tidal_id, i, tracks[i])
 
+                # One failed search must not abort the whole playlist
+                for i in sorted(track_futures):
+                    tr = tracks[i]
                     try:
-                        print(f"  Searching: '{query}'")
-                        search_result = self.session.search(query)
-
-                        # Handle different response structures
-                        tracks_list = []
-                        if isinstance(search_result, dict):
-                            if 'tracks' in search_result and search_result['tracks']:
-                                tracks_list = search_result['tracks']
-                            elif hasattr(search_result, 'tracks') and search_result.tracks:
-                                tracks_list = search_result.tracks
-                        elif hasattr(search_result, 'tracks'):
-                            tracks_list = search_result.tracks
-
-                        if tracks_list:
-                            print(f"    Found {len(tracks_list)} results")
-                            # Try to find the best match with better matching logic
-                            for idx, tidal_track in enumerate(tracks_list[:5]):  # Check first 5 results for speed
-                                try:
-                                    # Score the match quality
-                                    match_score = self._calculate_match_score(tr, tidal_track)
-
-                                    # Only add if it's a reasonable match
-                                    if match_score > 0.4:  # Slightly higher threshold for faster decisions
-                                        # Add track to playlist
-                                        if hasattr(playlist, 'add'):
-                                            result = playlist.add([tidal_track.id])
-                                        else:
-                                            # Fallback for direct API method
-                                            result = playlist.add([tidal_track.id])
-
-                                        print(f"✓ Added: {tr['artist']} - {tr['title']} -> {tidal_track.name} (score: {match_score:.2f})")
-                                        added_count += 1
-                                        track_found = True
-                                        time.sleep(0.1)  # Reduced pause after successful add
-                                        break
-                                    else:
-                                        print(f"    Skipped: {tidal_track.name} (low score: {match_score:.2f})")
-
-                                except Exception as add_error:
-                                    print(f"    Failed to add track {tidal_track.name}: {add_error}")
-                                    continue
-
-                            if track_found:
-                                break
-                        else:
-                            print(f"    No tracks found for: '{query}'")
-
+                        tidal_id, match_score = track_futures[i].result()
                     except Exception as search_error:
-                        if "data" in str(search_error).lower():
-                            print(f"    Rate limited, waiting...")
-                            time.sleep(1)  # Reduced wait for rate limiting
-                        else:
-                            print(f"    Search error for '{query}': {search_error}")
-                        continue
-
-                if not track_found:
-                    print(f"NOT FOUND after all strategies: {tr['artist']} - {tr['title']}")
-                    not_found_count += 1
+                        print(f"    Search failed for {tr['artist']} - {tr['title']}: {search_error}")
+                        tidal_id, match_score = None, 0.0
+
+                    if tidal_id:
+                        track_ids[i] = tidal_id
+                        # Weak matches are used this run but searched again next time
+                        if match_score >= self.STRONG_MATCH:
+                            self.cache.set(tr['artist'], tr['title'], tidal_id, match_score)
+                    else:
+                        print(f"NOT FOUND after all strategies: {tr['artist']} - {tr['title']}")
+                        not_found_count += 1
+
+            self.cache.save()
+            # Two source tracks can match the same Tidal track; add it only once
+            matched_ids = list(dict.fromkeys(tidal_id for tidal_id in track_ids if tidal_id))
+
+            # Add all matches in a few batched requests instead of one per track
+            for start in range(0, len(matched_ids), 50):
+                batch = matched_ids[start:start + 50]
+                if start:
+                    time.sleep(0.1)  # Short pause between batches
+                try:
+                    # Only count what Tidal reports as added (it skips unavailable tracks)
+                    added_count += len(playlist.add(batch))
+                except Exception as add_error:
+                    print(f"Failed to add batch of {len(batch)} tracks: {add_error}")
 
             print(f"\nPlaylist created: {playlist_name}")
             print(f"Tracks added: {added_count}")
@@ -387,55 +570,282 @@ class TidalPlaylistCreator:
             print(f"Error creating playlist: {e}")
             return False
 
-    def _calculate_match_score(self, original_track, tidal_track):
-        """Calculate how well a Tidal track matches the original track"""
+    @staticmethod
+    def _search_queries(tr):
+        """Yield search queries for a track, most likely to succeed first"""
+        yield f"{tr['artist']} {tr['title']}"  # Original - most likely
+        yield f'"{tr['artist']}" "{tr['title']}"'  # Quoted for exact match
+        yield f"{tr['artist']} - {tr['title']}"  # With dash
+
+        # Looser variations are only built if the first attempts fail
+        yield f"{tr['title']} {tr['artist']}"  # Reversed
+
+        # Add remix/version variations
+        if '(' in tr['title']:
+            base_title = tr['title'].split('(')[0].strip()
+            if len(base_title) > 8:  # Only if base title is specific enough
+                yield f"{tr['artist']} {base_title}"
+
+        if '[' in tr['title']:
+            base_title = tr['title'].split('[')[0].strip()
+            if len(base_title) > 8:
+                yield f"{tr['artist']} {base_title}"
+
+    def _create_tidal_playlist(self, playlist_name, description):
+        """Create the playlist, trying the last working strategy first"""
+        if not self._create_strategy:
+            self._create_strategy = self._load_strategy()
+
+        strategies = list(self.CREATE_STRATEGIES)
+        if self._create_strategy in strategies:
+            strategies.remove(self._create_strategy)
+            strategies.insert(0, self._create_strategy)
+
+        transient = False
+        for strategy in strategies:
+            try:
+                playlist = getattr(self, f'_create_{strategy}')(playlist_name, description)
+            except Exception as e:
+                print(f"Playlist creation ({strategy}) failed: {e}")
+                transient = transient or self._is_transient(e)
+                continue
+
+            if strategy != self._create_strategy:
+                self._create_strategy = strategy
+                # A network error or 5xx says nothing about the skipped strategy,
+                # so only remember the fallback for this run
+                if not transient:
+                    self._save_strategy(strategy)
+            return playlist
+
+        return None
+
+    def _create_standard(self, playlist_name, description):
+        return self.session.user.create_playlist(playlist_name, description)
+
+    def _create_no_description(self, playlist_name, description):
+        return self.session.user.create_playlist(playlist_name, "")
+
+    def _create_direct(self, playlist_name, description):
+        url = f"https://api.tidal.com/v1/users/{self.session.user.id}/playlists"
+        headers = {
+            'X-Tidal-Token': self.session.access_token,
+            'Authorization': f'Bearer {self.session.access_token}',
+            'Content-Type': 'application/json'
+        }
+        data = {
+            'title': playlist_name,
+            'description': description[:500]  # Limit description length
+        }
+
+        response = self._http.post(url, json=data, headers=headers)
+        if response.status_code != 201:
+            raise requests.HTTPError(f"{response.status_code} - {response.text}", response=response)
+
+        # Create a mock playlist object for adding tracks
+        playlist = MockPlaylist(response.json()['uuid'], self.session, self._http, response.headers.get('etag'))
+        print(f"Created playlist using direct API: {playlist_name}")
+        return playlist
+
+    @staticmethod
+    def _is_transient(error):
+        """Return True for failures that may pass on retry: network errors, 429 and 5xx"""
+        if isinstance(error, (requests.ConnectionError, requests.Timeout, RetryError, TooManyRequests)):
+            return True
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+        return status is not None and (status == 429 or status >= 500)
+
+    def _load_strategy(self):
+        """Return the playlist creation strategy that worked on a previous run"""
+        try:
+            return self.STRATEGY_PATH.read_text().strip()
+        except OSError:
+            return None
+
+    def _save_strategy(self, strategy):
+        """Remember the working playlist creation strategy for future runs"""
+        try:
+            self.STRATEGY_PATH.parent.mkdir(parents=True, exist_ok=True)
+            self.STRATEGY_PATH.write_text(strategy)
+        except OSError as e:
+            print(f"Could not save playlist creation strategy: {e}")
+
+    def _find_tidal_id(self, i, tr):
+        """Search Tidal for a track and return (best matching track ID or None, score)"""
+        # Keep the best reasonable match from the first query that finds one
+        best_id = None
+        best_name = None
+        best_score = self.MATCH_THRESHOLD
+        artist_tokens = self._norm['artist_tokens'][i]
+
+        # Searches run in parallel, so tag every line with the track it belongs to
+        tag = f"[{i + 1}/{len(self._norm['artist_tokens'])}]"
+        print(f"Processing track {tag}: {tr['artist']} - {tr['title']}")
+
+        # Queries are generated lazily so an early match skips the rest
+        for query_idx, query in enumerate(self._search_queries(tr)):
+            # Rate limiting - wait between searches to avoid flooding
+            if query_idx > 0 and self.QUERY_DELAY:
+                time.sleep(self.QUERY_DELAY)
+
+            # Skip overly generic queries
+            if len(query.strip()) < 5:
+                continue
+
+            try:
+                print(f"  {tag} Searching: '{query}'")
+                search_result = self.session.search(query)
+                tracks_list = self._extract(search_result)
+
+                if tracks_list:
+                    print(f"    {tag} Found {len(tracks_list)} results")
+                    # Try to find the best match with better matching logic
+                    for idx, tidal_track in enumerate(tracks_list[:5]):  # Check first 5 results for speed
+                        try:
+                            tidal_artist = tidal_track.artist.name if hasattr(tidal_track.artist, 'name') else str(tidal_track.artist)
+                            tidal_artist_lc = tidal_artist.lower()
+                            tidal_title_lc = tidal_track.name.lower()
+                        except Exception as score_error:
+                            print(f"    {tag} Failed to score track {tidal_track.name}: {score_error}")
+                            continue
+
+                        # Cheap prefilter: skip candidates sharing no artist word
+                        if artist_tokens.isdisjoint(tidal_artist_lc.split()):
+                            print(f"    {tag} Skipped: {tidal_track.name} (different artist: {tidal_artist})")
+                            continue
+
+                        # Score the match quality
+                        match_score = self._score(i, tidal_artist_lc, tidal_title_lc)
+
+                        # A strong match ends the search right away
+                        if match_score >= self.STRONG_MATCH:
+                            print(f"✓ {tag} Matched: {tr['artist']} - {tr['title']} -> {tidal_track.name} (score: {match_score:.2f})")
+                            return tidal_track.id, match_score
+
+                        if match_score > best_score:
+                            best_id, best_name, best_score = tidal_track.id, tidal_track.name, match_score
+                        else:
+                            print(f"    {tag} Skipped: {tidal_track.name} (low score: {match_score:.2f})")
+
+                    # Looser queries only run when nothing here passed the threshold
+                    if best_id:
+                        break
+                else:
+                    print(f"    {tag} No tracks found for: '{query}'")
+                    time.sleep(random.uniform(0.1, 0.2))  # Jittered pause before trying a looser query
+
+            except Exception as search_error:
+                # "data" errors are Tidal throttling without a 429; real 429s end up
+                # as TooManyRequests/RetryError once the adapter's retries run out
+                if isinstance(search_error, (TooManyRequests, RetryError)) or "data" in str(search_error).lower():
+                    print(f"    {tag} Rate limited, waiting...")
+                    time.sleep(random.uniform(1, 2))  # Reduced, jittered wait for rate limiting
+                else:
+                    print(f"    {tag} Search error for '{query}': {search_error}")
+                continue
+
+        if best_id:
+            print(f"✓ {tag} Matched: {tr['artist']} - {tr['title']} -> {best_name} (score: {best_score:.2f})")
+        return best_id, best_score
+
+    def _match_artist_group(self, indices, tracks):
+        """Match several tracks by one artist against a single artist search"""
+        artist = tracks[indices[0]]['artist']
+        try:
+            print(f"  Searching artist: '{artist}' ({len(indices)} tracks)")
+            search_result = self.session.search(artist, models=[tidalapi.media.Track], limit=300)
+            tracks_list = self._extract(search_result)
+        except Exception as search_error:
+            print(f"    Search error for '{artist}': {search_error}")
+            return {}
+
+        # Lowercase every candidate once, drop those sharing no artist word,
+        # then score the rest against each title
+        artist_tokens = self._norm['artist_tokens'][indices[0]]
+        candidates = []
+        for tidal_track in tracks_list:
+            try:
+                tidal_artist = tidal_track.artist.name if hasattr(tidal_track.artist, 'name') else str(tidal_track.artist)
+                tidal_artist_lc = tidal_artist.lower()
+                if artist_tokens.isdisjoint(tidal_artist_lc.split()):
+                    continue
+                candidates.append((tidal_track, tidal_artist_lc, tidal_track.name.lower()))
+            except Exception:
+                continue
+
+        # The pool is the artist's whole catalogue, so the best fuzzy score is
+        # not good enough on its own: only accept a near-exact title with a
+        # strong overall score and leave the rest to the per-track queries
+        matches = {}
+        for i in indices:
+            title_lc = self._norm['title_lc'][i]
+            best_track = None
+            best_score = self.STRONG_MATCH
+            for tidal_track, tidal_artist_lc, tidal_title_lc in candidates:
+                if fuzz.WRatio(title_lc, tidal_title_lc) < 90:
+                    continue
+                match_score = self._score(i, tidal_artist_lc, tidal_title_lc)
+                if match_score >= best_score:
+                    best_track, best_score = tidal_track, match_score
+
+            if best_track:
+                tr = tracks[i]
+                print(f"✓ Matched: {tr['artist']} - {tr['title']} -> {best_track.name} (score: {best_score:.2f})")
+                matches[i] = (best_track.id, best_score)
+
+        return matches
+
+    def _bind_extractor(self):
+        """Pick the search result extractor for the installed tidalapi version"""
         try:
-            orig_artist = original_track['artist'].lower()
-            orig_title = original_track['title'].lower()
+            probe = self.session.search('test', models=[tidalapi.media.Track], limit=1)
+        except Exception as e:
+            print(f"Search probe failed, assuming dict results: {e}")
+            return
 
-            tidal_artist = tidal_track.artist.name.lower() if hasattr(tidal_track.artist, 'name') else str(tidal_track.artist).lower()
-            tidal_title = tidal_track.name.lower()
+        if isinstance(probe, dict):
+            self._extract = lambda result: result.get('tracks') or []
+        else:
+            self._extract = lambda result: getattr(result, 'tracks', None) or []
 
-            # Simple scoring based on substring matches
-            artist_score = 0
-            title_score = 0
+    def _score(self, i, tidal_artist_lc, tidal_title_lc):
+        """Calculate how well a lowercased Tidal artist/title matches track i"""
+        # Fuzzy similarity (0-100) of each field
+        artist_score = fuzz.WRatio(self._norm['artist_lc'][i], tidal_artist_lc) / 100
+        title_score = fuzz.WRatio(self._norm['title_lc'][i], tidal_title_lc) / 100
 
-            # Artist matching
-            if orig_artist in tidal_artist or tidal_artist in orig_artist:
-                artist_score = 0.8
-            elif any(word in tidal_artist for word in orig_artist.split() if len(word) > 2):
-                artist_score = 0.5
+        # Both fields must match on their own - an exact artist must not
+        # carry an unrelated title over the threshold
+        if title_score < 0.75 or artist_score < 0.6:
+            return 0.0
 
-            # Title matching
-            if orig_title in tidal_title or tidal_title in orig_title:
-                title_score = 0.8
-            elif any(word in tidal_title for word in orig_title.split() if len(word) > 2):
-                title_score = 0.5
+        # The title is what tells tracks by the same artist apart
+        return 0.4 * artist_score + 0.6 * title_score
 
-            # Bonus for exact matches
-            if orig_artist == tidal_artist:
-                artist_score = 1.0
-            if orig_title == tidal_title:
-                title_score = 1.0
 
-            return (artist_score + title_score) / 2
+def normalize_tracks(tracks):
+    """Pre-lowercase track fields into parallel lists indexed like tracks"""
+    return {
+        'artist_lc': [track['artist'].lower() for track in tracks],
+        'title_lc': [track['title'].lower() for track in tracks],
+        'artist_tokens': [set(track['artist'].lower().split()) for track in tracks],
+    }
 
-        except Exception:
-            return 0.1  # Low score if we can't compare
 
+def _dedupe_key(value):
+    """Normalize a field for duplicate detection"""
+    return ' '.join(DEDUPE_NOISE_RE.sub('', value).lower().split())
 
-def remove_duplicates(tracks):
-    """Remove duplicate tracks based on artist and title"""
-    seen = set()
-    unique_tracks = []
 
+def remove_duplicates(tracks):
+    """Remove duplicate tracks based on normalized artist and title"""
+    # dicts keep insertion order, so the first occurrence of each track wins
+    unique_tracks = {}
     for track in tracks:
-        key = (track['artist'].lower(), track['title'].lower())
-        if key not in seen:
-            unique_tracks.append(track)
-            seen.add(key)
+        key = (_dedupe_key(track['artist']), _dedupe_key(track['title']))
+        unique_tracks.setdefault(key, track)
 
-    return unique_tracks
+    return list(unique_tracks.values())
 
 
 def main():
@@ -521,14 +931,15 @@ Configuration:
     if not scraper.start_browser():
         sys.exit(1)
 
-    all_tracks = []
     try:
-        for url in config.tracklist_urls:
-            tracks = scraper.scrape_tracklist(url)
-            all_tracks.extend(tracks)
+        # Tracklist URLs are independent, so scrape them concurrently
+        with ThreadPoolExecutor(max_workers=min(4, len(config.tracklist_urls))) as executor:
+            results = list(executor.map(scraper.scrape_tracklist, config.tracklist_urls))
     finally:
         scraper.stop_browser()
 
+    all_tracks = [track for tracks in results for track in tracks]
+
     if not all_tracks:
         print("No tracks found!")
         sys.exit(1)